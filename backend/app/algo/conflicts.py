@@ -1,10 +1,62 @@
 from typing import List, Dict, Tuple
+from collections import defaultdict, deque
 import math
-from datetime import datetime, timedelta
+from datetime import datetime
+import numpy as np
+
+try:
+	from numba import njit
+except ImportError:  # Numba is optional; the sweep runs as plain Python without it
+	def njit(*args, **kwargs):
+		return lambda fn: fn
 
 # Enhanced conflict detection with AI-powered predictions
 # Considers train speeds, safe distances, platform conflicts, and maintenance windows
 
+# "HH:MM" for every minute of the day, indexed by minutes since midnight
+_HHMM = tuple(f"{m // 60:02d}:{m % 60:02d}" for m in range(1440))
+
+@njit(cache=True, nogil=True)
+def _sweep_conflicts(dep: np.ndarray, arr: np.ndarray, start: int) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+	"""Resolve section overlaps in departure order.
+
+	Returns the conflicting train indices, the train each one clashes with and
+	the delay applied. ``arr`` is updated in place with the resolved arrivals.
+	"""
+	n = dep.shape[0]
+	indices = np.empty(n, dtype=np.int32)
+	prevs = np.empty(n, dtype=np.int32)
+	delays = np.empty(n, dtype=np.int32)
+	count = 0
+	
+	# Latest arrival among trains already on the section
+	max_idx = 0
+	for i in range(1, start):
+		if arr[i] > arr[max_idx]:
+			max_idx = i
+	
+	for i in range(start, n):
+		max_arrival = arr[max_idx]
+		if dep[i] < max_arrival + 5:  # 5-minute safety buffer
+			delay = max(5, max_arrival - dep[i] + 5)
+			indices[count] = i
+			prevs[count] = max_idx
+			delays[count] = delay
+			count += 1
+			arr[i] += delay
+		if arr[i] > arr[max_idx]:
+			max_idx = i
+	
+	return indices[:count], prevs[:count], delays[:count]
+
+
+def warm_up() -> None:
+	"""Compile the sweep kernel ahead of the first request"""
+	dep = np.array([0, 1], dtype=np.int32)
+	arr = np.array([10, 11], dtype=np.int32)
+	_sweep_conflicts(dep, arr, 1)
+
+
 def detect_and_resolve_conflicts(
 	schedule: List[Dict],
 	sections: List[Dict],
@@ -12,6 +64,9 @@ def detect_and_resolve_conflicts(
 	if not schedule:
 		return schedule, 0
 
+	# One timestamp is shared by every conflict raised in this run
+	now_str = datetime.now().strftime("%H:%M:%S")
+
 	def parse_ts(ts: str) -> int:
 		"""Convert time string to minutes since midnight"""
 		try:
@@ -24,22 +79,10 @@ def detect_and_resolve_conflicts(
 		except Exception:
 			return 0
 
-	def calculate_travel_time(train_speed: int, section_length: float) -> int:
-		"""Calculate travel time based on train speed and section length"""
-		if train_speed <= 0:
-			return 5  # minimum 5 minutes
-		return max(5, int((section_length / train_speed) * 60))
-
-	def predict_conflicts(schedule: List[Dict], sections: List[Dict]) -> List[Dict]:
+	def predict_conflicts(by_section: Dict[str, List[Dict]], sections: List[Dict]) -> List[Dict]:
 		"""AI-powered conflict prediction"""
 		conflicts = []
 		
-		# Group by section
-		by_section: Dict[str, List[Dict]] = {}
-		for item in schedule:
-			sec = item.get("section_id") or item.get("section") or ""
-			by_section.setdefault(sec, []).append(item)
-
 		# Get section info
 		section_info = {s.get("section_id"): s for s in sections}
 		
@@ -52,78 +95,69 @@ def detect_and_resolve_conflicts(
 			capacity = section.get("capacity_per_hour", 8)
 			
 			# Sort by departure time
-			items.sort(key=lambda x: parse_ts(x.get("departure_time", "00:00")))
+			items.sort(key=lambda x: x["_dep_min"])
 			
-			for i in range(len(items)):
+			# Struct-of-arrays view of the section for vectorized travel windows
+			n = len(items)
+			dep = np.fromiter((x["_dep_min"] for x in items), dtype=np.int32, count=n)
+			spd = np.fromiter((x["_speed"] for x in items), dtype=np.int32, count=n)
+			# Branch-free: stopped trains (speed <= 0) are masked to 0 and lifted to the 5-minute floor
+			travel = np.maximum(5, (section_length * 60 // np.maximum(spd, 1)).astype(np.int32) * (spd > 0))
+			arr = dep + travel
+			
+			# Everything before the first buffer violation is already conflict-free
+			hits = np.flatnonzero(dep[1:] < np.maximum.accumulate(arr[:-1]) + 5)
+			if not hits.size:
+				continue
+			
+			indices, prevs, delays = _sweep_conflicts(dep, arr, int(hits[0]) + 1)
+			
+			for i, p, delay_minutes in zip(indices.tolist(), prevs.tolist(), delays.tolist()):
 				current = items[i]
-				departure = parse_ts(current.get("departure_time", "00:00"))
-				train_speed = current.get("max_speed_kmph", 100)
-				travel_time = calculate_travel_time(train_speed, section_length)
-				arrival = departure + travel_time
+				prev = items[p]
+				conflict_type = "section-overlap"
+				severity = "high" if dep[i] < arr[p] else "medium"
+				
+				conflicts.append({
+					"id": f"C{len(conflicts)+1:03d}",
+					"type": conflict_type,
+					"severity": severity,
+					"trains": [prev.get("train_id"), current.get("train_id")],
+					"location": f"Section {sec_id} (KM {int(section_length*0.3)}-{int(section_length*0.7)})",
+					"resolvedBy": "AI Optimizer",
+					"suggestion": f"Delay {current.get('train_id')} by {delay_minutes} minutes to avoid conflict",
+					"timestamp": now_str,
+					"predicted_delay": delay_minutes
+				})
 				
-				# Check for conflicts with previous trains
-				for j in range(i):
-					prev = items[j]
-					prev_departure = parse_ts(prev.get("departure_time", "00:00"))
-					prev_speed = prev.get("max_speed_kmph", 100)
-					prev_travel_time = calculate_travel_time(prev_speed, section_length)
-					prev_arrival = prev_departure + prev_travel_time
-					
-					# Check for time overlap
-					if departure < prev_arrival + 5:  # 5-minute safety buffer
-						conflict_type = "section-overlap"
-						severity = "high" if departure < prev_arrival else "medium"
-						
-						conflicts.append({
-							"id": f"C{len(conflicts)+1:03d}",
-							"type": conflict_type,
-							"severity": severity,
-							"trains": [prev.get("train_id"), current.get("train_id")],
-							"location": f"Section {sec_id} (KM {int(section_length*0.3)}-{int(section_length*0.7)})",
-							"resolvedBy": "AI Optimizer",
-							"suggestion": f"Delay {current.get('train_id')} by {max(5, prev_arrival - departure + 5)} minutes to avoid conflict",
-							"timestamp": datetime.now().strftime("%H:%M:%S"),
-							"predicted_delay": max(5, prev_arrival - departure + 5)
-						})
-						
-						# Apply resolution
-						delay_minutes = max(5, prev_arrival - departure + 5)
-						current["departure_time"] = (datetime.strptime(current.get("departure_time", "00:00"), "%H:%M") + 
-													timedelta(minutes=delay_minutes)).strftime("%H:%M")
-						current["ai_resolved"] = True
-						current["delay_reason"] = f"Conflict with {prev.get('train_id')}"
+				# Apply resolution
+				new_min = (current["_dep_min"] + delay_minutes) % 1440
+				current["departure_time"] = _HHMM[new_min]
+				current["_dep_min"] = new_min
+				current["ai_resolved"] = True
+				current["delay_reason"] = f"Conflict with {prev.get('train_id')}"
 		
 		return conflicts
 
-	def check_platform_conflicts(schedule: List[Dict]) -> List[Dict]:
+	def check_platform_conflicts(by_station: Dict[str, List[Dict]]) -> List[Dict]:
 		"""Check for platform conflicts at stations"""
 		conflicts = []
 		
-		# Group by station and time
-		station_usage = {}
-		for item in schedule:
-			station = item.get("source") or item.get("currentStation", "MSH")
-			departure = parse_ts(item.get("departure_time", "00:00"))
-			
-			if station not in station_usage:
-				station_usage[station] = []
-			station_usage[station].append((departure, item))
-		
 		# Check for platform conflicts
-		for station, trains in station_usage.items():
-			trains.sort(key=lambda x: x[0])
+		for station, trains in by_station.items():
+			# Sort on departures as resolved by the section pass
+			trains.sort(key=lambda x: x["_dep_min"])
 			platforms = 4 if station == "MSH" else 6  # Platform count
 			
-			for i in range(len(trains)):
-				current_time, current_train = trains[i]
-				conflicting_trains = []
-				
-				for j in range(max(0, i-platforms), i):
-					prev_time, prev_train = trains[j]
-					if current_time - prev_time < 10:  # 10-minute platform occupancy
-						conflicting_trains.append(prev_train.get("train_id"))
+			# Trains still occupying a platform, oldest first
+			window = deque()
+			for i, current_train in enumerate(trains):
+				current_time = current_train["_dep_min"]
+				while window and current_time - window[0]["_dep_min"] >= 10:  # 10-minute platform occupancy
+					window.popleft()
 				
-				if conflicting_trains:
+				if len(window) >= platforms:
+					conflicting_trains = [prev_train.get("train_id") for prev_train in window]
 					conflicts.append({
 						"id": f"C{len(conflicts)+1:03d}",
 						"type": "platform-conflict",
@@ -132,20 +166,39 @@ def detect_and_resolve_conflicts(
 						"location": f"{station} Junction Platform {i%platforms + 1}",
 						"resolvedBy": "AI Optimizer",
 						"suggestion": f"Reassign {current_train.get('train_id')} to Platform {(i+1)%platforms + 1}",
-						"timestamp": datetime.now().strftime("%H:%M:%S")
+						"timestamp": now_str
 					})
+				
+				window.append(current_train)
 		
 		return conflicts
 
-	# Run conflict detection
-	section_conflicts = predict_conflicts(schedule, sections)
-	platform_conflicts = check_platform_conflicts(schedule)
+	# Single pass over the schedule: parse each departure once and bucket the
+	# item by section and by station; both conflict passes work off this
+	by_section: Dict[str, List[Dict]] = {}
+	by_station: Dict[str, List[Dict]] = {}
+	for item in schedule:
+		item["_dep_min"] = parse_ts(item.get("departure_time", "00:00"))
+		item["_speed"] = item.get("max_speed_kmph", 100)
+		by_section.setdefault(item.get("section_id") or item.get("section") or "", []).append(item)
+		by_station.setdefault(item.get("source") or item.get("currentStation", "MSH"), []).append(item)
+
+	# Run conflict detection; platforms see the departures the section pass resolved
+	section_conflicts = predict_conflicts(by_section, sections)
+	platform_conflicts = check_platform_conflicts(by_station)
 	
 	all_conflicts = section_conflicts + platform_conflicts
 	total_conflicts = len(all_conflicts)
 	
+	# Index conflicts by train so each item is attributed with one lookup
+	conflicts_by_train: Dict[str, List[Dict]] = defaultdict(list)
+	for c in all_conflicts:
+		for train_id in dict.fromkeys(c.get("trains", [])):
+			conflicts_by_train[train_id].append(c)
+	
 	# Store conflicts for frontend
 	for item in schedule:
-		item["conflicts"] = [c for c in all_conflicts if item.get("train_id") in c.get("trains", [])]
+		del item["_dep_min"], item["_speed"]
+		item["conflicts"] = list(conflicts_by_train.get(item.get("train_id"), ()))
 	
 	return schedule, total_conflicts
@@ -13,13 +13,16 @@ def optimize_schedule(
 	priority_map = {"goods": 1, "passenger": 3, "express": 4}
 	train_priority = {t.get("id") or t.get("train_id"): t.get("priority") or priority_map.get(t.get("type"), 2) for t in trains}
 
-	optimized = sorted(
-		schedules,
-		key=lambda s: (
-			-1 * train_priority.get(s.get("train_id"), 1),
-			s.get("departure_time", "")
-		),
-	)
+	# Resolve the sort rank once per train rather than once per schedule row
+	rank = {train_id: -1 * priority for train_id, priority in train_priority.items()}
+
+	# Decorate-sort-undecorate; the row index breaks ties so dicts are never compared
+	decorated = [
+		(rank.get(s.get("train_id"), -1), s.get("departure_time", ""), idx, s)
+		for idx, s in enumerate(schedules)
+	]
+	decorated.sort()
+	optimized = [row[3] for row in decorated]
 	conflicts_resolved = 0
 	objective_value = None
 	return optimized, conflicts_resolved, objective_value
@@ -1,26 +1,22 @@
 from typing import List, Dict, Tuple
-import simpy
 
-# Minimal simulation: each schedule entry generates depart/arrive events with fixed durations
+# Minimal simulation: each schedule entry generates depart/arrive events with fixed durations.
+# Travel times are constant, so events are emitted directly; bring back SimPy once
+# resources (platforms, blocks) actually contend.
 
 def simulate_movements(schedule: List[Dict], sections: List[Dict], seed: int | None = None) -> Tuple[List[Dict], Dict]:
-	env = simpy.Environment()
-	events: List[Dict] = []
-
-	def process_train(item: Dict):
-		train_id = item.get("train_id")
-		section_id = (item.get("section_id") or "").split("|")[0]
-		start_min = 0
-		travel_min = 5
-		# depart
-		events.append({"t": env.now, "type": "depart", "train_id": train_id, "section": section_id})
-		yield env.timeout(travel_min)
-		# arrive
-		events.append({"t": env.now, "type": "arrive", "train_id": train_id, "section": section_id})
+	travel_min = 5
+	trains = [
+		(item.get("train_id"), (item.get("section_id") or "").split("|")[0])
+		for item in schedule[:5]
+	]
 
-	for item in schedule[:5]:
-		env.process(process_train(item))
+	events: List[Dict] = []
+	# every train departs at t=0, then all arrive together after the fixed travel time
+	for train_id, section_id in trains:
+		events.append({"t": 0, "type": "depart", "train_id": train_id, "section": section_id})
+	for train_id, section_id in trains:
+		events.append({"t": travel_min, "type": "arrive", "train_id": train_id, "section": section_id})
 
-	env.run()
 	stats = {"runtime_s": 0.0, "num_events": len(events)}
 	return events, stats
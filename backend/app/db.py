@@ -1,6 +1,7 @@
 from __future__ import annotations
 from typing import Optional
-from sqlmodel import SQLModel, Field, create_engine, Session
+from sqlalchemy import event
+from sqlmodel import SQLModel, Field, create_engine, Session, select
 import csv
 import os
 
@@ -8,9 +9,19 @@ DB_URL = os.getenv("RAILSYNC_DB_URL", "sqlite:///./railsync.db")
 engine = create_engine(DB_URL, echo=False)
 
 
+if engine.dialect.name == "sqlite":
+	@event.listens_for(engine, "connect")
+	def _set_sqlite_pragmas(dbapi_connection, connection_record) -> None:
+		# WAL lets readers proceed while a write is in flight
+		cursor = dbapi_connection.cursor()
+		cursor.execute("PRAGMA journal_mode=WAL")
+		cursor.execute("PRAGMA synchronous=NORMAL")
+		cursor.close()
+
+
 class Train(SQLModel, table=True):
 	id: Optional[int] = Field(default=None, primary_key=True)
-	train_id: str
+	train_id: str = Field(index=True, unique=True)
 	type: str
 	priority: int
 	max_speed_kmph: int
@@ -25,14 +36,21 @@ def seed_from_csv() -> None:
 	with Session(engine) as session:
 		trains_path = "data/trains.csv"
 		if os.path.exists(trains_path):
+			# train_id is unique, so only seed trains not already stored
+			seen = set(session.exec(select(Train.train_id)).all())
 			with open(trains_path, newline="") as f:
 				reader = csv.DictReader(f)
+				rows = []
 				for row in reader:
-					train = Train(
-						train_id=row["train_id"],
-						type=row["type"],
-						priority=int(row["priority"]),
-						max_speed_kmph=int(row["max_speed_kmph"]),
-					)
-					session.add(train)
+					if row["train_id"] in seen:
+						continue
+					seen.add(row["train_id"])
+					rows.append({
+						"train_id": row["train_id"],
+						"type": row["type"],
+						"priority": int(row["priority"]),
+						"max_speed_kmph": int(row["max_speed_kmph"]),
+					})
+			# single executemany instead of one ORM-tracked INSERT per row
+			session.bulk_insert_mappings(Train, rows)
 			session.commit()
@@ -1,9 +1,15 @@
-from fastapi import FastAPI
+from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
 from typing import Any
-from fastapi.responses import JSONResponse
+from fastapi.responses import ORJSONResponse, Response
 from pydantic import BaseModel
+import asyncio
+import functools
+import hashlib
 import math
+import time
+
+import orjson
 
 from .models import (
 	OptimizeRequest,
@@ -13,11 +19,11 @@ from .models import (
 	MetricsResponse,
 )
 from .algo.optimizer import optimize_schedule
-from .algo.conflicts import detect_and_resolve_conflicts
+from .algo.conflicts import detect_and_resolve_conflicts, warm_up
 from .algo.simulator import simulate_movements
 from .db import init_db, seed_from_csv
 
-app = FastAPI(title="AI Rail Sync Backend", version="0.1.0")
+app = FastAPI(title="AI Rail Sync Backend", version="0.1.0", default_response_class=ORJSONResponse)
 
 app.add_middleware(
 	CORSMiddleware,
@@ -32,6 +38,7 @@ app.add_middleware(
 async def on_startup() -> None:
 	init_db()
 	seed_from_csv()
+	warm_up()
 
 
 @app.get("/health")
@@ -39,16 +46,15 @@ async def health() -> dict:
 	return {"status": "ok"}
 
 
-@app.post("/optimize", response_model=OptimizeResponse)
-async def optimize(req: OptimizeRequest) -> Any:
+def _run_optimize(data: dict) -> dict:
 	optimized, conflicts_resolved, objective_value = optimize_schedule(
-		[dict(x) for x in req.trains],
-		[dict(x) for x in req.schedules],
-		[dict(x) for x in req.sections],
-		[dict(x) for x in req.stations],
-		req.constraints or {},
+		data["trains"],
+		data["schedules"],
+		data["sections"],
+		data["stations"],
+		data["constraints"] or {},
 	)
-	optimized, extra_conflicts = detect_and_resolve_conflicts(optimized, [dict(x) for x in req.sections])
+	optimized, extra_conflicts = detect_and_resolve_conflicts(optimized, data["sections"])
 	return {
 		"optimized_schedule": optimized,
 		"conflicts_resolved": conflicts_resolved + extra_conflicts,
@@ -56,6 +62,12 @@ async def optimize(req: OptimizeRequest) -> Any:
 	}
 
 
+@app.post("/optimize", response_model=OptimizeResponse)
+async def optimize(req: OptimizeRequest) -> Any:
+	# CPU-bound; run it on a worker thread so the event loop keeps serving requests
+	return await asyncio.to_thread(_run_optimize, req.model_dump())
+
+
 @app.post("/simulate", response_model=SimulateResponse)
 async def simulate(req: SimulateRequest) -> Any:
 	events, stats = simulate_movements(req.schedule, req.sections, req.seed)
@@ -137,9 +149,25 @@ TRACKS = {
 }
 
 
+def _json_with_etag(payload: Any) -> tuple[bytes, str]:
+    body = orjson.dumps(payload)
+    return body, f'"{hashlib.md5(body).hexdigest()}"'
+
+
+def _cached_json_response(request: Request, body: bytes, etag: str) -> Response:
+    """Serve pre-serialized JSON, answering 304 when the client copy is current"""
+    headers = {"ETag": etag}
+    if request.headers.get("if-none-match") == etag:
+        return Response(status_code=304, headers=headers)
+    return Response(content=body, media_type="application/json", headers=headers)
+
+
+_TRACKS_BYTES, _TRACKS_ETAG = _json_with_etag(TRACKS)
+
+
 @app.get("/tracks")
-async def get_tracks() -> Any:
-    return JSONResponse(TRACKS)
+async def get_tracks(request: Request) -> Response:
+    return _cached_json_response(request, _TRACKS_BYTES, _TRACKS_ETAG)
 
 
 @app.get("/stations")
@@ -152,26 +180,28 @@ def _interpolate(a: tuple[float, float], b: tuple[float, float], t: float) -> tu
     return (a[0] + (b[0] - a[0]) * t, a[1] + (b[1] - a[1]) * t)
 
 
+# Sample schedule data for conflict detection; rows are copied per request
+# because detection rewrites departure times in place
+_SAMPLE_SCHEDULE = (
+    {"train_id": "T001", "departure_time": "06:00", "source": "MSH", "destination": "BRC", "section_id": "MSH_BRC", "max_speed_kmph": 130},
+    {"train_id": "T002", "departure_time": "06:15", "source": "MSH", "destination": "BRC", "section_id": "MSH_BRC", "max_speed_kmph": 120},
+    {"train_id": "T003", "departure_time": "06:30", "source": "MSH", "destination": "BRC", "section_id": "MSH_BRC", "max_speed_kmph": 100},
+    {"train_id": "T004", "departure_time": "06:45", "source": "MSH", "destination": "BRC", "section_id": "MSH_BRC", "max_speed_kmph": 95},
+    {"train_id": "T005", "departure_time": "07:00", "source": "MSH", "destination": "BRC", "section_id": "MSH_BRC", "max_speed_kmph": 80},
+    {"train_id": "T006", "departure_time": "07:15", "source": "MSH", "destination": "BRC", "section_id": "MSH_BRC", "max_speed_kmph": 75},
+)
+
+_SAMPLE_SECTIONS = (
+    {"section_id": "MSH_BRC", "length_km": 85, "capacity_per_hour": 8},
+)
+
+
 @app.get("/conflicts")
 async def get_conflicts() -> Any:
     """Get AI-generated conflict predictions"""
-    from .algo.conflicts import detect_and_resolve_conflicts
-    
-    # Sample schedule data for conflict detection
-    sample_schedule = [
-        {"train_id": "T001", "departure_time": "06:00", "source": "MSH", "destination": "BRC", "section_id": "MSH_BRC", "max_speed_kmph": 130},
-        {"train_id": "T002", "departure_time": "06:15", "source": "MSH", "destination": "BRC", "section_id": "MSH_BRC", "max_speed_kmph": 120},
-        {"train_id": "T003", "departure_time": "06:30", "source": "MSH", "destination": "BRC", "section_id": "MSH_BRC", "max_speed_kmph": 100},
-        {"train_id": "T004", "departure_time": "06:45", "source": "MSH", "destination": "BRC", "section_id": "MSH_BRC", "max_speed_kmph": 95},
-        {"train_id": "T005", "departure_time": "07:00", "source": "MSH", "destination": "BRC", "section_id": "MSH_BRC", "max_speed_kmph": 80},
-        {"train_id": "T006", "departure_time": "07:15", "source": "MSH", "destination": "BRC", "section_id": "MSH_BRC", "max_speed_kmph": 75},
-    ]
+    sample_schedule = [dict(r) for r in _SAMPLE_SCHEDULE]
     
-    sample_sections = [
-        {"section_id": "MSH_BRC", "length_km": 85, "capacity_per_hour": 8}
-    ]
-    
-    optimized_schedule, conflicts_resolved = detect_and_resolve_conflicts(sample_schedule, sample_sections)
+    optimized_schedule, conflicts_resolved = detect_and_resolve_conflicts(sample_schedule, list(_SAMPLE_SECTIONS))
     
     # Extract conflicts from the optimized schedule
     all_conflicts = []
@@ -182,44 +212,44 @@ async def get_conflicts() -> Any:
     return {"conflicts": all_conflicts, "total_resolved": conflicts_resolved}
 
 
-@app.get("/trains")
-async def get_trains(t: float = 0.0) -> list[TrainPosition]:
-    # Route from Mehsana to Ahmedabad to Vadodara
-    path_msh_adi = [
+# Route from Mehsana to Ahmedabad to Vadodara
+_PATHS = {
+    "MSH-ADI": (
         (72.3693, 23.5894),  # Mehsana Junction
         (72.5714, 23.0225),  # Ahmedabad Junction
-    ]
-    path_adi_brc = [
+    ),
+    "ADI-BRC": (
         (72.5714, 23.0225),  # Ahmedabad Junction
         (73.1812, 22.3072),  # Vadodara Junction
-    ]
-    
-    # Basic progress from wall-clock
-    import time
-    prog = (time.time() * 0.01) % 1.0 if t == 0.0 else (t % 1.0)
-    
-    # 6 sample trains with different positions and speeds
+    ),
+}
+
+# Tracks are straight lines, so each route has a fixed heading
+_HEADINGS = {
+    route: math.degrees(math.atan2(b[0] - a[0], b[1] - a[1]))
+    for route, (a, b) in _PATHS.items()
+}
+
+# 6 sample trains with different positions and speeds
+_TRAIN_DATA = (
+    {"id": "T001", "name": "Mehsana Express", "speed": 120, "status": "on-time", "route": "MSH-ADI"},
+    {"id": "T002", "name": "Ahmedabad-Vadodara Fast", "speed": 110, "status": "on-time", "route": "ADI-BRC"},
+    {"id": "T003", "name": "Mehsana Passenger", "speed": 85, "status": "delayed", "route": "MSH-ADI"},
+    {"id": "T004", "name": "Local Service", "speed": 75, "status": "on-time", "route": "ADI-BRC"},
+    {"id": "T005", "name": "Freight Train", "speed": 60, "status": "delayed", "route": "ADI-BRC"},
+    {"id": "T006", "name": "Goods Express", "speed": 55, "status": "on-time", "route": "MSH-ADI"},
+)
+
+
+@functools.lru_cache(maxsize=256)
+def _compute_trains(prog: float) -> tuple[bytes, str]:
+    """Serialized train positions and their ETag for one progress value"""
     trains = []
-    train_data = [
-        {"id": "T001", "name": "Mehsana Express", "speed": 120, "status": "on-time", "route": "MSH-ADI"},
-        {"id": "T002", "name": "Ahmedabad-Vadodara Fast", "speed": 110, "status": "on-time", "route": "ADI-BRC"},
-        {"id": "T003", "name": "Mehsana Passenger", "speed": 85, "status": "delayed", "route": "MSH-ADI"},
-        {"id": "T004", "name": "Local Service", "speed": 75, "status": "on-time", "route": "ADI-BRC"},
-        {"id": "T005", "name": "Freight Train", "speed": 60, "status": "delayed", "route": "ADI-BRC"},
-        {"id": "T006", "name": "Goods Express", "speed": 55, "status": "on-time", "route": "MSH-ADI"},
-    ]
-    
-    for i, train in enumerate(train_data):
+    for i, train in enumerate(_TRAIN_DATA):
         # Position trains along their respective tracks
         train_progress = (prog + i * 0.15) % 1.0  # Spread trains along the track
-        
-        if train["route"] == "MSH-ADI":
-            path = path_msh_adi
-        else:  # ADI-BRC
-            path = path_adi_brc
-            
+        path = _PATHS[train["route"]]
         train_lng, train_lat = _interpolate(path[0], path[1], train_progress)
-        heading = math.degrees(math.atan2(path[1][0] - path[0][0], path[1][1] - path[0][1]))
         
         trains.append(TrainPosition(
             id=train["id"],
@@ -227,8 +257,17 @@ async def get_trains(t: float = 0.0) -> list[TrainPosition]:
             lat=train_lat,
             lng=train_lng,
             speed=train["speed"],
-            heading=heading,
+            heading=_HEADINGS[train["route"]],
             status=train["status"]
-        ))
+        ).model_dump())
     
-    return trains
+    return _json_with_etag(trains)
+
+
+@app.get("/trains", response_model=list[TrainPosition])
+async def get_trains(request: Request, t: float = 0.0) -> Response:
+    # Basic progress from wall-clock, advanced in whole-second steps so
+    # requests within the same second share one cached payload
+    prog = (int(time.time()) * 0.01) % 1.0 if t == 0.0 else (t % 1.0)
+    body, etag = _compute_trains(prog)
+    return _cached_json_response(request, body, etag)